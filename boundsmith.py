@@ -1,123 +1,487 @@
 """BoundSmith core — extract boundary conditions from Python AST."""
 import ast
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
+from typing import MutableMapping, cast
 
+try:
+    from fast_walk import walk_unordered as _walk  # type: ignore[import-not-found]
+except ImportError:
+    _walk = None
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Boundary:
     file: str
     line: int
     variable: str
     operator: str
-    value: object
-    triplet: tuple
+    value: int | float
+    step: int | float
     expression: str
 
+    @property
+    def triplet(self) -> tuple:
+        v, s = self.value, self.step
+        return (v - s, v, v + s)
+
+    # Explicit pickle support: the methods dataclasses generates for frozen
+    # slotted classes fail once mypyc compiles the class, and pooled scans
+    # pickle every Boundary.
+    def __getstate__(self):
+        return [getattr(self, f.name) for f in fields(self)]
+
+    def __setstate__(self, state):
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
+
 
 _OP = {ast.Gt: ">", ast.GtE: ">=", ast.Lt: "<", ast.LtE: "<=",
        ast.Eq: "==", ast.NotEq: "!="}
 _FLIP = {ast.Gt: ast.Lt, ast.Lt: ast.Gt, ast.GtE: ast.LtE,
          ast.LtE: ast.GtE, ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+# Operator text for the flipped pair, so no flipped op node is built.
+_FLIP_OP = {cls: _OP[flipped] for cls, flipped in _FLIP.items()}
 
 
-def _name(node):
-    if isinstance(node, ast.Name):
-        return node.id
-    if isinstance(node, (ast.Call, ast.Attribute, ast.Subscript)):
-        return ast.unparse(node)
+def _unary_literal(node: ast.UnaryOp):
+    if type(node.op) is ast.USub and type(node.operand) is ast.Constant:
+        v = node.operand.value
+        if isinstance(v, (int, float)):
+            return -v
     return None
 
 
+def _const_literal(node: ast.Constant):
+    v = node.value
+    return v if isinstance(v, (int, float)) else None
+
+
+# Exact-type dispatch: one dict lookup per comparator instead of an
+# isinstance chain.
+_NAME_HANDLERS = {ast.Name: attrgetter("id"), ast.Call: ast.unparse,
+                  ast.Attribute: ast.unparse, ast.Subscript: ast.unparse}
+_LITERAL_HANDLERS = {ast.Constant: _const_literal, ast.UnaryOp: _unary_literal}
+
+
+def _name(node, handlers=_NAME_HANDLERS):
+    handler = handlers.get(type(node))
+    return None if handler is None else handler(node)
+
+
 def _literal(node):
-    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
-        return node.value
-    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
-        if isinstance(node.operand, ast.Constant):
-            v = node.operand.value
-            if isinstance(v, (int, float)):
-                return -v
-    return None
+    handler = _LITERAL_HANDLERS.get(type(node))
+    return None if handler is None else handler(node)
 
 
-class _Extractor(ast.NodeVisitor):
+class _Extractor:
     def __init__(self, filename: str):
-        self.filename = filename
+        self.filename = sys.intern(filename)
         self.results: list[Boundary] = []
+        # Chained comparisons unparse the same nodes repeatedly. Nodes live
+        # as long as the tree being scanned, so id() keys cannot collide.
+        self._unparse_cache: dict[int, str] = {}
+        self._name_handlers = {t: self._unparse if h is ast.unparse else h
+                               for t, h in _NAME_HANDLERS.items()}
+
+    def _unparse(self, node) -> str:
+        text = self._unparse_cache.get(id(node))
+        if text is None:
+            text = self._unparse_cache[id(node)] = ast.unparse(node)
+        return text
 
     def visit_Compare(self, node: ast.Compare):
+        # A pair can only yield a Boundary from its non-literal side, so
+        # classify both operands once and try just that direction. Only the
+        # ordering/equality operators in _OP define a boundary; is/in pairs
+        # are skipped.
         left = node.left
+        left_val = _literal(left)
         for op, comp in zip(node.ops, node.comparators):
-            self._try_pair(left, op, comp, node)
-            flipped_cls = _FLIP.get(type(op))
-            if flipped_cls:
-                self._try_pair(comp, flipped_cls(), left, node)
-            left = comp
-        self.generic_visit(node)
-
-    def _try_pair(self, var_node, op, val_node, ctx):
-        name = _name(var_node)
-        val = _literal(val_node)
-        if name is None or val is None:
+            comp_val = _literal(comp)
+            if comp_val is not None:
+                if left_val is None:
+                    op_str = _OP.get(type(op))
+                    if op_str:
+                        self._try_pair(left, op_str, comp_val, node)
+            elif left_val is not None:
+                flipped = _FLIP_OP.get(type(op))
+                if flipped:
+                    self._try_pair(comp, flipped, left_val, node)
+            left, left_val = comp, comp_val
+
+    def _try_pair(self, var_node, op_str: str, val, ctx):
+        name = _name(var_node, self._name_handlers)
+        if name is None:
             return
         step = 1 if isinstance(val, int) else 0.1
-        op_str = _OP.get(type(op), "?")
         self.results.append(Boundary(
-            self.filename, ctx.lineno, name, op_str, val,
-            (val - step, val, val + step), ast.unparse(ctx),
+            self.filename, ctx.lineno, sys.intern(name), op_str, val,
+            step, self._unparse(ctx),
         ))
 
 
-def extract_boundaries(source: str, filename: str = "<stdin>") -> list[Boundary]:
-    visitor = _Extractor(filename)
-    visitor.visit(ast.parse(source))
-    return visitor.results
+# Fields that hold annotations or format specs. Numbers there
+# (``Literal[3]``) are not test inputs, so test-value collection skips
+# them. Boundary extraction walks every field: a comparison can sit in an
+# annotation, e.g. ``Annotated[int, Predicate(lambda v: v > 0)]``.
+_SKIP_FIELDS: dict[type[ast.AST], frozenset[str]] = {
+    ast.arg: frozenset({"annotation"}),
+    ast.AnnAssign: frozenset({"annotation"}),
+    ast.FunctionDef: frozenset({"returns"}),
+    ast.AsyncFunctionDef: frozenset({"returns"}),
+    ast.FormattedValue: frozenset({"format_spec"}),
+}
+_LITERAL_FIELDS: dict[type[ast.AST], tuple[str, ...]] = {}
+
+
+def _literal_fields(cls: type[ast.AST]) -> tuple[str, ...]:
+    skip = _SKIP_FIELDS.get(cls, frozenset())
+    walk = _LITERAL_FIELDS[cls] = tuple(f for f in cls._fields if f not in skip)
+    return walk
+
+
+def _is_bare_str(node: ast.Expr) -> bool:
+    value = node.value
+    return type(value) is ast.Constant and isinstance(value.value, str)
+
+
+def _walk_unordered(tree: ast.AST, prune: bool = False) -> list:
+    # Pure-Python stand-in for fast_walk: ast.walk pays for a deque plus a
+    # nested iter_child_nodes generator per node, and callers ignore order.
+    # With prune, _SKIP_FIELDS and bare string statements (docstrings) are
+    # not entered.
+    nodes = [tree]
+    for node in nodes:
+        cls = type(node)
+        walk = cls._fields
+        if prune:
+            if cls is ast.Expr and _is_bare_str(cast(ast.Expr, node)):
+                continue
+            pruned = _LITERAL_FIELDS.get(cls)
+            walk = pruned if pruned is not None else _literal_fields(cls)
+        for f in walk:
+            child = getattr(node, f, None)
+            if isinstance(child, ast.AST):
+                nodes.append(child)
+            elif isinstance(child, list):
+                nodes.extend(x for x in child if isinstance(x, ast.AST))
+    return nodes
+
+
+def _nodes(tree: ast.AST):
+    """Return every node of *tree*, in no order."""
+    return _walk_unordered(tree) if _walk is None else _walk(tree)
+
+
+def _pos(node: ast.Compare) -> tuple:
+    return node.lineno, node.col_offset
+
+
+def _boundaries_in(tree: ast.AST, filename: str) -> list[Boundary]:
+    compares = [node for node in _nodes(tree) if type(node) is ast.Compare]
+    # The walk is unordered; report boundaries by source position.
+    compares.sort(key=_pos)
+    extractor = _Extractor(filename)
+    for node in compares:
+        extractor.visit_Compare(node)
+    return extractor.results
+
+
+# Node types _literals_walked has to look at.
+_LITERAL_OWNERS = frozenset(_SKIP_FIELDS) | {ast.Constant}
+
+
+def _literals_walked(tree: ast.AST) -> set:
+    # fast_walk cannot skip subtrees. One filtering pass keeps Constants
+    # and the owners of _SKIP_FIELDS; only the small subtrees under those
+    # fields are walked again, to drop the Constants inside them.
+    # Docstrings need no rule: a bare string holds no numeric Constant.
+    found = []
+    roots = []
+    for node in [n for n in _walk(tree) if type(n) in _LITERAL_OWNERS]:
+        cls = type(node)
+        if cls is ast.Constant:
+            if isinstance(node.value, (int, float)):
+                found.append(node)
+        else:
+            for f in _SKIP_FIELDS[cls]:
+                child = getattr(node, f, None)
+                if child is not None:
+                    roots.append(child)
+    if roots and found:
+        drop = {id(n) for root in roots for n in _walk(root)}
+        return {n.value for n in found if id(n) not in drop}
+    return {n.value for n in found}
+
+
+def _literals_in(tree: ast.AST) -> set:
+    if _walk is not None:
+        return _literals_walked(tree)
+    return {node.value for node in _walk_unordered(tree, prune=True)
+            if type(node) is ast.Constant and isinstance(node.value, (int, float))}
+
+
+# Parse with a direct compile() call and one shared flag set instead of
+# going through the ast.parse wrapper per file. optimize is left at its
+# default: it does not change a PyCF_ONLY_AST tree, and stripping asserts
+# would drop the very literals scan_tests looks for.
+_PARSE_FLAGS = ast.PyCF_ONLY_AST
+
+
+def _parse(source: str | bytes, filename: str = "<unknown>") -> ast.Module:
+    return compile(source, filename, "exec", _PARSE_FLAGS, dont_inherit=True)
+
+
+def extract_boundaries(source: str | bytes, filename: str = "<stdin>") -> list[Boundary]:
+    return _boundaries_in(_parse(source, filename), filename)
+
+
+def extract_test_values(source: str | bytes) -> set:
+    return _literals_in(_parse(source))
+
+
+def find_uncovered(boundaries: list[Boundary],
+                   test_values: set | frozenset) -> list[Boundary]:
+    tv = (test_values if isinstance(test_values, (set, frozenset))
+          else frozenset(test_values))
+    uncovered = []
+    for b in boundaries:
+        # Probe the triplet directly rather than building it; stops at
+        # the first missing value.
+        v, s = b.value, b.step
+        if not (v - s in tv and v in tv and v + s in tv):
+            uncovered.append(b)
+    return uncovered
 
 
-def extract_test_values(source: str) -> set:
-    return {n.value for n in ast.walk(ast.parse(source))
-            if isinstance(n, ast.Constant) and isinstance(n.value, (int, float))}
+_SAFE = str.maketrans({".": "_", "(": "", ")": "", "[": "", "]": "", " ": ""})
 
 
-def find_uncovered(boundaries: list[Boundary], test_values: set) -> list[Boundary]:
-    return [b for b in boundaries
-            if not all(v in test_values for v in b.triplet)]
+def _render_test(i: int, b: Boundary) -> str:
+    vals = ", ".join(repr(v) for v in b.triplet)
+    return (
+        f'@pytest.mark.parametrize("val", [{vals}])\n'
+        f"def test_boundary_{b.variable.translate(_SAFE)}_{i}(val):\n"
+        f'    """Boundary: {b.expression} at {b.file}:{b.line}"""\n'
+        f"    result = val {b.operator} {b.value!r}\n"
+        f"    assert isinstance(result, bool)"
+    )
 
 
 def generate_test_file(boundaries: list[Boundary]) -> str:
-    parts = ["import pytest"]
-    for i, b in enumerate(boundaries):
-        safe = b.variable.replace(".", "_").replace("(", "").replace(")", "")
-        safe = safe.replace("[", "").replace("]", "").replace(" ", "")
-        vals = ", ".join(repr(v) for v in b.triplet)
-        parts.append(
-            f'@pytest.mark.parametrize("val", [{vals}])\n'
-            f"def test_boundary_{safe}_{i}(val):\n"
-            f'    """Boundary: {b.expression} at {b.file}:{b.line}"""\n'
-            f"    result = val {b.operator} {b.value!r}\n"
-            f"    assert isinstance(result, bool)"
-        )
-    return "\n\n\n".join(parts) + "\n"
-
-
-def scan_path(path: Path) -> list[Boundary]:
-    results = []
-    for f in sorted(path.rglob("*.py")):
-        if f.name.startswith("test_") or f.name == "conftest.py":
+    body = "\n\n\n".join(_render_test(i, b) for i, b in enumerate(boundaries))
+    return f"import pytest\n\n\n{body}\n" if body else "import pytest\n"
+
+
+# Below this many files, process start-up costs more than it saves.
+_POOL_MIN_FILES = 64
+
+
+def _iter_py(root: str) -> list[str]:
+    """Return the sorted ``*.py`` file paths under *root* as plain strings."""
+    found = []
+    dirs = [root]
+    while dirs:
+        try:
+            it = os.scandir(dirs.pop())
+        except OSError:
             continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    found.append(entry.path)
+    # Compare by path component, as sorted(Path) does, so "a/" sorts
+    # before "a-b/".
+    found.sort(key=lambda p: p.split(os.sep))
+    return found
+
+
+def _is_test_file(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.startswith("test_") or name == "conftest.py"
+
+
+def _read(path: str) -> bytes:
+    # compile() decodes bytes itself (honouring PEP 263 cookies), so skip
+    # the text-mode and buffering layers for whole-file reads.
+    with open(path, "rb", buffering=0) as fh:
+        return fh.read()
+
+
+def _has_compare(data: bytes) -> bool:
+    # Boundaries come only from the operators in _OP, and each contains one
+    # of these, so files failing the check yield nothing from
+    # extract_boundaries either. bytes.__contains__ is a memchr-backed scan,
+    # several times cheaper than a regex search.
+    return b"<" in data or b">" in data or b"==" in data or b"!=" in data
+
+
+def _scan_one(path: str) -> list[Boundary]:
+    try:
+        source = _read(path)
+        if not _has_compare(source):
+            return []
+        return _boundaries_in(_parse(source, path), path)
+    except SyntaxError:
+        return []
+
+
+def _scan_one_tests(path: str) -> set:
+    try:
+        return _literals_in(_parse(_read(path), path))
+    except SyntaxError:
+        return set()
+
+
+def _map_files(fn, files: list[str], max_workers: int | None):
+    # max_workers=None means one worker per CPU, as in ProcessPoolExecutor.
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < _POOL_MIN_FILES:
+        return map(fn, files)
+    with ProcessPoolExecutor(max_workers) as ex:
+        return list(ex.map(fn, files, chunksize=16))
+
+
+_CACHE_PATH = Path(".boundsmith_cache.json")
+
+
+@lru_cache(maxsize=None)
+def _cache_version() -> str | None:
+    # Results depend on this module's code, so any edit to it (or a
+    # recompiled build) invalidates the cache without a hand-bumped number.
+    try:
+        with open(__file__, "rb") as fh:
+            return hashlib.sha256(fh.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_cache(path: Path = _CACHE_PATH) -> dict:
+    """Load the per-file scan cache, or return an empty one."""
+    version = _cache_version()
+    if version is None:
+        return {}
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def save_cache(cache: dict, path: Path = _CACHE_PATH) -> None:
+    """Write *cache* to *path*, replacing the file in one step."""
+    version = _cache_version()
+    if version is None:
+        return
+    # Write to a sibling temp file and rename it over the target, so a
+    # concurrent run never reads a half-written cache.
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp",
+                                   dir=path.parent)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"version": version, "files": cache}, fh)
+        os.replace(tmp, path)
+    except OSError:
         try:
-            results.extend(extract_boundaries(f.read_text("utf-8"), str(f)))
-        except SyntaxError:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _bounds_to_rows(bounds: list[Boundary]) -> list:
+    return [[b.line, b.variable, b.operator, b.value, b.step, b.expression]
+            for b in bounds]
+
+
+def _bounds_from_rows(rows: list, path: str) -> list[Boundary]:
+    if not isinstance(rows, list):
+        raise ValueError("malformed cache entry")
+    path = sys.intern(path)
+    bounds = []
+    for line, var, op, val, step, expr in rows:
+        if not (isinstance(line, int) and isinstance(var, str)
+                and isinstance(op, str) and isinstance(expr, str)
+                and isinstance(val, (int, float))
+                and isinstance(step, (int, float))):
+            raise ValueError("malformed cache row")
+        bounds.append(Boundary(path, line, sys.intern(var), op, val, step, expr))
+    return bounds
+
+
+def _literals_from_rows(rows: list, path: str) -> set:
+    if not isinstance(rows, list) or not all(
+            isinstance(v, (int, float)) for v in rows):
+        raise ValueError("malformed cache entry")
+    return set(rows)
+
+
+def _map_cached(fn, files, max_workers, cache, kind, encode, decode) -> list:
+    # Entries are keyed on the absolute path and hit only while the file's
+    # (st_mtime_ns, st_size) is unchanged, so an unchanged tree costs one
+    # stat() per file. Malformed entries are treated as misses. Hits are
+    # stored back, so a layered cache (a ChainMap over the loaded one)
+    # collects exactly the entries this run used.
+    if cache is None:
+        return list(_map_files(fn, files, max_workers))
+    out: list = [None] * len(files)
+    todo: list[tuple[int, str, list[int] | None]] = []
+    for i, p in enumerate(files):
+        key = os.path.abspath(p)
+        try:
+            st = os.stat(p)
+        except OSError:
+            todo.append((i, key, None))
             continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(key)
+        if isinstance(entry, dict) and entry.get("stat") == stamp and kind in entry:
+            try:
+                out[i] = decode(entry[kind], p)
+                cache[key] = entry
+                continue
+            except (TypeError, ValueError):
+                pass
+        todo.append((i, key, stamp))
+    fresh = _map_files(fn, [files[i] for i, _, _ in todo], max_workers)
+    for (i, key, stat), result in zip(todo, fresh):
+        out[i] = result
+        if stat is not None:
+            cache[key] = {"stat": stat, kind: encode(result)}
+    return out
+
+
+def scan_path(path: Path, max_workers: int | None = 1,
+              cache: MutableMapping | None = None) -> list[Boundary]:
+    files = [p for p in _iter_py(str(path)) if not _is_test_file(p)]
+    results = []
+    for bounds in _map_cached(_scan_one, files, max_workers, cache,
+                              "bounds", _bounds_to_rows, _bounds_from_rows):
+        results.extend(bounds)
     return results
 
 
-def scan_tests(path: Path) -> set:
+def scan_tests(path: Path, max_workers: int | None = 1,
+               cache: MutableMapping | None = None) -> set:
+    files = [p for p in _iter_py(str(path)) if _is_test_file(p)]
     values: set = set()
-    for f in sorted(path.rglob("*.py")):
-        if f.name.startswith("test_") or f.name == "conftest.py":
-            try:
-                values |= extract_test_values(f.read_text("utf-8"))
-            except SyntaxError:
-                continue
+    for literals in _map_cached(_scan_one_tests, files, max_workers, cache,
+                                "literals", list, _literals_from_rows):
+        values |= literals
     return values
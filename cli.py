@@ -1,12 +1,21 @@
 """BoundSmith CLI — hunt boundary condition blind spots."""
 import json
+import math
+import os
+import sys
+from collections import ChainMap
 from pathlib import Path
 
 import typer
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 from boundsmith import (
     extract_boundaries, find_uncovered, generate_test_file,
-    scan_path, scan_tests,
+    load_cache, save_cache, scan_path, scan_tests,
 )
 
 app = typer.Typer(
@@ -15,31 +24,66 @@ app = typer.Typer(
 )
 
 
+def _echo_json(bounds) -> None:
+    data = [{"file": b.file, "line": b.line, "var": b.variable,
+             "op": b.operator, "value": b.value,
+             "triplet": list(b.triplet), "expr": b.expression}
+            for b in bounds]
+    # orjson writes inf as null; such payloads go through the stdlib so the
+    # data does not depend on the encoder. Only value can be non-finite:
+    # the triplet is derived from it.
+    finite = all(math.isfinite(b.value) for b in bounds
+                 if isinstance(b.value, float))
+    if orjson is not None and finite:
+        try:
+            payload = orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:  # e.g. ints wider than 64 bits
+            pass
+        else:
+            buffer = getattr(sys.stdout, "buffer", None)
+            if buffer is None:  # e.g. redirected to a StringIO
+                typer.echo(payload.decode(), nl=False)
+                return
+            sys.stdout.flush()
+            buffer.write(payload)
+            buffer.flush()
+            return
+    typer.echo(json.dumps(data, indent=2))
+
+
 @app.command()
 def scan(
     src: Path = typer.Argument(..., help="Source directory or .py file to scan"),
     tests: Path = typer.Option(None, "--tests", "-t", help="Test dir to cross-check"),
     generate: Path = typer.Option(None, "--generate", "-g", help="Output test file"),
     as_json: bool = typer.Option(False, "--json", help="JSON output for CI"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore .boundsmith_cache.json"),
+    jobs: int = typer.Option(os.cpu_count() or 1, "--jobs", "-j", min=1,
+                             help="Worker processes for directory scans"),
 ):
     """Scan Python source for boundary conditions and find uncovered ones."""
+    # Only directory scans consult the cache; a lone file is parsed directly.
+    use_cache = not no_cache and (src.is_dir() or tests is not None)
+    # Scans read through to the loaded cache but record every entry they use
+    # in the top layer, so entries for deleted files or other trees are not
+    # written back.
+    cache = ChainMap({}, load_cache()) if use_cache else None
     if src.is_file():
-        boundaries = extract_boundaries(src.read_text("utf-8"), str(src))
+        boundaries = extract_boundaries(src.read_bytes(), str(src))
     elif src.is_dir():
-        boundaries = scan_path(src)
+        boundaries = scan_path(src, jobs, cache=cache)
     else:
         typer.echo(f"Error: {src} not found", err=True)
         raise typer.Exit(1)
 
-    test_values = scan_tests(tests) if tests else set()
+    test_values = scan_tests(tests, jobs, cache=cache) if tests else set()
+    if cache is not None:
+        save_cache(cache.maps[0])
     uncovered = find_uncovered(boundaries, test_values) if test_values else boundaries
 
     if as_json:
-        data = [{"file": b.file, "line": b.line, "var": b.variable,
-                 "op": b.operator, "value": b.value,
-                 "triplet": list(b.triplet), "expr": b.expression}
-                for b in uncovered]
-        typer.echo(json.dumps(data, indent=2))
+        _echo_json(uncovered)
     else:
         total, miss = len(boundaries), len(uncovered)
         typer.echo(f"\U0001f3f9 BoundSmith: {total} boundaries, {miss} uncovered\n")
@@ -0,0 +1,78 @@
+"""Packaging for the BoundSmith core module.
+
+When mypyc is importable at build time (e.g. ``pip install mypy`` then
+``pip install --no-build-isolation .``) boundsmith.py is also compiled to a
+C extension, which takes precedence over the .py on import. Without mypyc,
+or if the compile fails, the pure-Python module is installed unchanged.
+The CLI is not installed; run ``python cli.py`` from a checkout.
+"""
+from distutils import log
+from importlib.util import find_spec
+
+from setuptools import Distribution, setup
+from setuptools.command.build_ext import build_ext
+
+# Commands that compile. egg_info and sdist only need metadata and
+# sources, so they never pay for mypycify.
+_BUILD_COMMANDS = frozenset({"build", "build_ext", "bdist_wheel", "bdist_egg",
+                             "install", "develop", "editable_wheel"})
+
+
+def _mypyc_extensions() -> list:
+    if find_spec("mypyc") is None:
+        return []
+    from mypyc.build import mypycify
+    try:
+        return mypycify(["boundsmith.py"], opt_level="3")
+    except (Exception, SystemExit) as exc:  # SystemExit on type errors
+        log.warn("boundsmith: skipping mypyc build (%r)", exc)
+        return []
+
+
+class MypycDistribution(Distribution):
+    """Generate the mypyc extension before any command runs, so that
+    has_ext_modules(), and with it the wheel's platform tag, reflects
+    whether there is anything to compile."""
+
+    def run_commands(self):
+        if not self.ext_modules and _BUILD_COMMANDS.intersection(self.commands):
+            self.ext_modules = _mypyc_extensions()
+        super().run_commands()
+
+
+class OptionalBuildExt(build_ext):
+    """Fall back to the pure-Python module when no C compiler works."""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:
+            self.warn(f"boundsmith: skipping compiled extension ({exc!r})")
+            self._drop(list(self.extensions))
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as exc:
+            self.warn(f"boundsmith: skipping compiled extension {ext.name} ({exc!r})")
+            self._drop([ext])
+
+    def _drop(self, exts):
+        dist = self.distribution
+        dist.ext_modules = [e for e in dist.ext_modules or [] if e not in exts]
+        if not dist.has_ext_modules():
+            # bdist_wheel fixed its platform tag before the build ran.
+            wheel = dist.get_command_obj("bdist_wheel", create=False)
+            if wheel is not None:
+                wheel.root_is_pure = True
+
+
+setup(
+    name="boundsmith",
+    version="0.1.0",
+    description="Boundary condition blind spot hunter",
+    py_modules=["boundsmith"],
+    distclass=MypycDistribution,
+    cmdclass={"build_ext": OptionalBuildExt},
+    python_requires=">=3.11",
+)
@@ -1,7 +1,21 @@
 """Tests for BoundSmith core boundary extraction and generation."""
+import ast
+import contextlib
+import dataclasses
+import gc
+import io
+import json
+import os
+import pickle
+from collections import ChainMap
+
+import pytest
+
+import boundsmith
+import cli
 from boundsmith import (
-    extract_boundaries, extract_test_values,
-    find_uncovered, generate_test_file,
+    extract_boundaries, extract_test_values, find_uncovered,
+    generate_test_file, load_cache, save_cache, scan_path, scan_tests,
 )
 
 
@@ -91,3 +105,187 @@ def test_float_boundary():
     assert b.value == 0.5
     assert abs(b.triplet[0] - 0.4) < 0.01
     assert abs(b.triplet[2] - 0.6) < 0.01
+
+
+def test_scan_path_and_tests_split_by_filename(tmp_path):
+    (tmp_path / "app.py").write_text("if retry > 3: pass\n")
+    (tmp_path / "test_app.py").write_text("assert f(7) == 0\n")
+    (tmp_path / "broken.py").write_text("if x >\n")
+    bounds = scan_path(tmp_path)
+    assert [(b.variable, b.value) for b in bounds] == [("retry", 3)]
+    values = scan_tests(tmp_path)
+    assert {0, 7}.issubset(values)
+    values.add(8)  # callers get a plain, mutable set
+
+
+def test_scan_with_process_pool_matches_serial(tmp_path):
+    for i in range(4):
+        (tmp_path / f"mod{i}.py").write_text(f"if n{i} >= {i}: pass\n")
+        (tmp_path / f"test_mod{i}.py").write_text(f"assert g({i + 10})\n")
+    assert scan_path(tmp_path, max_workers=2) == scan_path(tmp_path, max_workers=1)
+    assert scan_tests(tmp_path, max_workers=2) == scan_tests(tmp_path, max_workers=1)
+
+
+def test_scan_is_serial_unless_workers_are_requested(tmp_path, monkeypatch):
+    for i in range(boundsmith._POOL_MIN_FILES):
+        (tmp_path / f"mod{i}.py").write_text(f"if n >= {i}: pass\n")
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(boundsmith, "ProcessPoolExecutor", no_pool)
+    assert len(scan_path(tmp_path)) == boundsmith._POOL_MIN_FILES
+    with pytest.raises(AssertionError):
+        scan_path(tmp_path, max_workers=2)
+
+
+def test_scan_cache_reuses_unchanged_files(tmp_path):
+    src = tmp_path / "app.py"
+    src.write_text("if x > 3: pass\n")
+    (tmp_path / "test_app.py").write_text("assert f(5)\n")
+    cache: dict = {}
+    first = scan_path(tmp_path, cache=cache)
+    assert scan_tests(tmp_path, cache=cache) == {5}
+    cache_file = tmp_path / "cache.json"
+    save_cache(cache, cache_file)
+    cache = load_cache(cache_file)
+    assert scan_path(tmp_path, cache=cache) == first
+    assert scan_tests(tmp_path, cache=cache) == {5}
+    src.write_text("if x > 30: pass\n")
+    assert [b.value for b in scan_path(tmp_path, cache=cache)] == [30]
+
+
+def test_load_cache_missing_or_corrupt(tmp_path):
+    assert load_cache(tmp_path / "missing.json") == {}
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    assert load_cache(bad) == {}
+    bad.write_text(json.dumps({"version": boundsmith._cache_version(), "files": []}))
+    assert load_cache(bad) == {}
+    bad.write_text(json.dumps({"version": 2, "files": {"x.py": {}}}))
+    assert load_cache(bad) == {}
+
+
+def test_layered_cache_keeps_only_entries_used(tmp_path):
+    (tmp_path / "app.py").write_text("if x > 3: pass\n")
+    cache_file = tmp_path / "cache.json"
+    save_cache({"/gone.py": {"stat": [0, 0], "bounds": []}}, cache_file)
+    first = ChainMap({}, load_cache(cache_file))
+    scan_path(tmp_path, cache=first)
+    save_cache(first.maps[0], cache_file)
+    assert list(load_cache(cache_file)) == [os.path.abspath(tmp_path / "app.py")]
+    again = ChainMap({}, load_cache(cache_file))
+    assert [b.value for b in scan_path(tmp_path, cache=again)] == [3]
+    assert again.maps[0] == again.maps[1]
+    assert sorted(os.listdir(tmp_path)) == ["app.py", "cache.json"]  # no temp files
+
+
+def test_malformed_cache_entries_are_misses(tmp_path):
+    (tmp_path / "app.py").write_text("if x > 3: pass\n")
+    (tmp_path / "test_app.py").write_text("assert f(5)\n")
+    app, test_app = (os.path.abspath(tmp_path / n) for n in ("app.py", "test_app.py"))
+    for junk in (None, 7, [], {"stat": None}):
+        cache = {app: junk, test_app: junk}
+        assert [b.value for b in scan_path(tmp_path, cache=cache)] == [3]
+        assert scan_tests(tmp_path, cache=cache) == {5}
+    stamps = {p: [os.stat(p).st_mtime_ns, os.stat(p).st_size] for p in (app, test_app)}
+    for bounds, literals in (([[1, "x"]], ["5"]), ("rows", 5), ([["1"] * 6], [[5]])):
+        cache = {app: {"stat": stamps[app], "bounds": bounds},
+                 test_app: {"stat": stamps[test_app], "literals": literals}}
+        assert [b.value for b in scan_path(tmp_path, cache=cache)] == [3]
+        assert scan_tests(tmp_path, cache=cache) == {5}
+
+
+def test_boundaries_are_hashable_for_dedup():
+    bounds = extract_boundaries("if 0 < x < 100: pass", "m.py")
+    again = extract_boundaries("if 0 < x < 100: pass", "m.py")
+    assert set(bounds) == set(again)
+    assert len(set(bounds + again)) == len(bounds)
+
+
+def test_expression_is_rendered_and_survives_pickle():
+    b = extract_boundaries("if len(items) >= 10: pass")[0]
+    clone = pickle.loads(pickle.dumps(b))
+    assert clone == b
+    assert clone.expression == b.expression == "len(items) >= 10"
+    assert dataclasses.asdict(b)["expression"] == "len(items) >= 10"
+
+
+def test_extract_syntax_error_names_the_file():
+    with pytest.raises(SyntaxError) as exc:
+        extract_boundaries("if x >\n", "pkg/mod.py")
+    assert exc.value.filename == "pkg/mod.py"
+
+
+def test_test_values_skip_annotations_and_docstrings(monkeypatch):
+    code = (
+        "def test_x(n: Literal[7]) -> Literal[8]:\n"
+        '    """Checks 9."""\n'
+        "    k: Literal[6] = 5\n"
+        "    assert f(k) == 0\n"
+    )
+    vals = extract_test_values(code)
+    assert {0, 5}.issubset(vals)
+    assert not {6, 7, 8} & vals
+    # An installed fast_walk must not change what is collected.
+    monkeypatch.setattr(boundsmith, "_walk", lambda tree: list(ast.walk(tree)))
+    assert extract_test_values(code) == vals
+
+
+def test_boundaries_inside_annotations_are_found(monkeypatch):
+    code = "def f(x: Annotated[int, Predicate(lambda v: v > 0)]): pass"
+    bounds = extract_boundaries(code)
+    assert [(b.variable, b.operator, b.value) for b in bounds] == [("v", ">", 0)]
+    monkeypatch.setattr(boundsmith, "_walk", lambda tree: list(ast.walk(tree)))
+    assert extract_boundaries(code) == bounds
+
+
+def test_scan_path_orders_files_like_sorted_paths(tmp_path):
+    for d in ("a-b", "a"):
+        (tmp_path / d).mkdir()
+        (tmp_path / d / "m.py").write_text(f"if {d.replace('-', '_')} > 1: pass\n")
+    assert [b.variable for b in scan_path(tmp_path)] == ["a", "a_b"]
+
+
+def test_chained_boundaries_share_one_render(monkeypatch):
+    calls = []
+    real = ast.unparse
+    monkeypatch.setattr(ast, "unparse", lambda n: calls.append(n) or real(n))
+    bounds = extract_boundaries("if 0 < x < 100: pass")
+    assert {b.expression for b in bounds} == {"0 < x < 100"}
+    assert len(calls) == 1
+
+
+def test_boundaries_do_not_keep_the_extractor_alive():
+    bounds = extract_boundaries("if 0 < x < 100: pass")
+    gc.collect()
+    assert not any(type(o) is boundsmith._Extractor for o in gc.get_objects())
+    assert bounds[0].expression == "0 < x < 100"
+
+
+def test_identity_and_membership_ops_are_not_boundaries(tmp_path):
+    only = "if x is 0: pass\nif y in 3: pass\n"
+    mixed = only + "z = a == 1\n"
+    for name, code in (("only.py", only), ("mixed.py", mixed)):
+        (tmp_path / name).write_text(code)
+        direct = extract_boundaries(code, str(tmp_path / name))
+        assert all(b.operator != "?" for b in direct)
+    scanned = scan_path(tmp_path)
+    assert [(b.variable, b.value) for b in scanned] == [("a", 1)]
+    assert scanned == extract_boundaries(mixed, str(tmp_path / "mixed.py"))
+
+
+def test_echo_json_keeps_data_on_both_encoders(capsys, monkeypatch):
+    for code in ("if r > 0.5: pass", "if r > 1e999: pass"):
+        bounds = extract_boundaries(code)
+        expected = [{"file": "<stdin>", "line": 1, "var": "r", "op": ">",
+                     "value": bounds[0].value, "triplet": list(bounds[0].triplet),
+                     "expr": bounds[0].expression}]
+        for encoder in {cli.orjson, None}:
+            monkeypatch.setattr(cli, "orjson", encoder)
+            cli._echo_json(bounds)
+            assert json.loads(capsys.readouterr().out) == expected
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                cli._echo_json(bounds)
+            assert json.loads(out.getvalue()) == expected